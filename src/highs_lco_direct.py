@@ -0,0 +1,265 @@
+"""
+highs_lco_direct.py
+--------------------
+Two-tier LCO demo solved through highspy directly, without Pyomo.
+
+Same 10-rooms × 5-days instance as pyomo_lco_mini.py:
+ - Tier L2: maximize expected revenue
+ - Tier L3: minimize expected overbooking slack with a revenue floor
+
+At this model size the modeling layer, not the solver, dominates wall
+time. This module assembles the coefficient matrix as NumPy arrays in
+row-wise sparse form and hands it to HiGHS in one call; between tiers it
+keeps the HiGHS instance alive and only adds the revenue-floor row and
+swaps the objective vector.
+
+Usage
+-----
+    pip install highspy numpy
+
+    python highs_lco_direct.py
+"""
+
+import numpy as np
+
+import highspy
+
+# ---------------------------------------------------------------------
+# Synthetic toy instance: 10 rooms × 5 days, 12 bookings
+# (identical to pyomo_lco_mini.py, kept local so the script is standalone)
+# ---------------------------------------------------------------------
+
+DAYS = 5
+ROOMS = 10
+days = list(range(1, DAYS + 1))
+rooms = list(range(1, ROOMS + 1))
+
+CAP = {d: ROOMS for d in days}
+
+# 12 bookings with (start_day, length_of_stay, price_per_night, show_prob)
+bookings = {
+    1:  (1, 2, 120, 0.92),
+    2:  (1, 3, 110, 0.85),
+    3:  (2, 2, 150, 0.90),
+    4:  (2, 3, 130, 0.80),
+    5:  (3, 2, 140, 0.88),
+    6:  (3, 3, 100, 0.83),
+    7:  (4, 2, 160, 0.87),
+    8:  (4, 2, 115, 0.78),
+    9:  (5, 1, 200, 0.95),
+    10: (1, 1, 180, 0.90),
+    11: (2, 1, 170, 0.82),
+    12: (3, 1, 175, 0.89),
+}
+
+B = list(bookings.keys())
+
+STAY_DAYS = {
+    b: list(range(s, min(s + L, DAYS + 1)))
+    for b, (s, L, _, _) in bookings.items()
+}
+
+
+# ---------------------------------------------------------------------
+# Column layout
+# ---------------------------------------------------------------------
+# Columns are laid out as one flat vector:
+#   [ a_b for b in B | y2_{b,r} for b in B, r in rooms | w_d for d in days ]
+
+NB, NR, ND = len(B), ROOMS, DAYS
+A_OFF = 0
+Y_OFF = NB
+W_OFF = NB + NB * NR
+NCOL = NB + NB * NR + ND
+
+INF = highspy.kHighsInf
+
+
+def a_col(b):
+    return A_OFF + B.index(b)
+
+
+def y_col(b, r):
+    return Y_OFF + B.index(b) * NR + (r - 1)
+
+
+def w_col(d):
+    return W_OFF + (d - 1)
+
+
+# ---------------------------------------------------------------------
+# Matrix assembly
+# ---------------------------------------------------------------------
+def build_highs_model():
+    """Assemble the Tier L2 model as a HighsLp (row-wise sparse arrays)."""
+    # Inverted index: bookings staying on each day
+    bookings_on_day = {d: [] for d in days}
+    for b in B:
+        for d in STAY_DAYS[b]:
+            bookings_on_day[d].append(b)
+
+    starts = [0]
+    index = []
+    value = []
+    row_lower = []
+    row_upper = []
+
+    def add_row(cols, coefs, lo, hi):
+        index.extend(cols)
+        value.extend(coefs)
+        starts.append(len(index))
+        row_lower.append(lo)
+        row_upper.append(hi)
+
+    # 1) Room exclusivity per (room, day): sum_b y2[b, r] <= 1
+    for d in days:
+        staying = bookings_on_day[d]
+        if not staying:
+            continue
+        for r in rooms:
+            add_row([y_col(b, r) for b in staying], [1.0] * len(staying),
+                    -INF, 1.0)
+
+    # 2) Assignment link per booking: sum_r y2[b, r] - a[b] == 0
+    for b in B:
+        add_row([y_col(b, r) for r in rooms] + [a_col(b)],
+                [1.0] * NR + [-1.0], 0.0, 0.0)
+
+    # 3) Overbooking slack per day: w[d] - sum_b showp[b] a[b] >= -Cap_d
+    for d in days:
+        staying = bookings_on_day[d]
+        add_row([w_col(d)] + [a_col(b) for b in staying],
+                [1.0] + [-bookings[b][3] for b in staying],
+                -float(CAP[d]), INF)
+
+    lp = highspy.HighsLp()
+    lp.num_col_ = NCOL
+    lp.num_row_ = len(row_lower)
+
+    # Tier L2 objective: revenue coefficients on the acceptance columns
+    col_cost = np.zeros(NCOL)
+    for b in B:
+        col_cost[a_col(b)] = bookings[b][2] * bookings[b][1]  # price * length
+    lp.col_cost_ = col_cost
+    lp.sense_ = highspy.ObjSense.kMaximize
+
+    # Bounds: binaries in [0, 1], slacks in [0, inf)
+    col_lower = np.zeros(NCOL)
+    col_upper = np.ones(NCOL)
+    col_upper[W_OFF:] = INF
+
+    # Symmetry breaking: rooms are interchangeable, so booking i (in index
+    # order) never needs a room numbered above i; clamp those binaries to 0.
+    for i, b in enumerate(B, start=1):
+        for r in rooms[i:]:
+            col_upper[y_col(b, r)] = 0.0
+
+    lp.col_lower_ = col_lower
+    lp.col_upper_ = col_upper
+
+    integrality = np.full(NCOL, highspy.HighsVarType.kInteger)
+    integrality[W_OFF:] = highspy.HighsVarType.kContinuous
+    lp.integrality_ = integrality
+
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+    lp.a_matrix_.start_ = np.asarray(starts, dtype=np.int32)
+    lp.a_matrix_.index_ = np.asarray(index, dtype=np.int32)
+    lp.a_matrix_.value_ = np.asarray(value)
+
+    lp.row_lower_ = np.asarray(row_lower)
+    lp.row_upper_ = np.asarray(row_upper)
+
+    return lp
+
+
+# ---------------------------------------------------------------------
+# Two-tier solve: L2 then L3 on the same HiGHS instance
+# ---------------------------------------------------------------------
+def run_two_tier_direct(eps=1e-6, verbose=True):
+    """Run Tier L2 then Tier L3 against one persistent HiGHS instance.
+
+    `eps` is a relative revenue-floor tolerance: the L3 floor is
+    Z2* - eps * max(1, |Z2*|). When the L2 acceptance already implies zero
+    overbooking slack on every day, the L3 solve is skipped -- w is bounded
+    below by expected shows minus capacity, so it cannot be improved.
+
+    Returns the same result dict shape as pyomo_lco_mini.run_two_tier_demo.
+    """
+    h = highspy.Highs()
+    h.setOptionValue("output_flag", False)
+    h.passModel(build_highs_model())
+
+    # Tier L2: maximize revenue
+    h.run()
+    sol = np.asarray(h.getSolution().col_value)
+    rev_cost = np.array([bookings[b][2] * bookings[b][1] for b in B])
+    Z2 = float(rev_cost @ sol[A_OFF:A_OFF + NB])
+
+    # Minimal slack implied by the L2 acceptance
+    a_l2 = sol[A_OFF:A_OFF + NB]
+    expected = np.zeros(ND)
+    for i, b in enumerate(B):
+        if a_l2[i] > 0.5:
+            for d in STAY_DAYS[b]:
+                expected[d - 1] += bookings[b][3]
+    caps = np.array([CAP[d] for d in days], dtype=float)
+    implied_slack = np.maximum(0.0, expected - caps)
+
+    if implied_slack.max() <= 1e-9:
+        # L2 incumbent is already lexicographically optimal; skip L3.
+        w_vals = implied_slack
+    else:
+        # Revenue floor as a new row, then swap the objective to Tier L3.
+        # The instance (and with it the L2 incumbent) stays loaded in HiGHS.
+        floor = Z2 - eps * max(1.0, abs(Z2))
+        h.addRow(floor, INF, NB,
+                 np.arange(A_OFF, A_OFF + NB, dtype=np.int32), rev_cost)
+        cols = np.arange(NCOL, dtype=np.int32)
+        new_cost = np.zeros(NCOL)
+        new_cost[W_OFF:] = 1.0
+        h.changeColsCost(NCOL, cols, new_cost)
+        h.changeObjectiveSense(highspy.ObjSense.kMinimize)
+
+        h.run()
+        sol = np.asarray(h.getSolution().col_value)
+        w_vals = sol[W_OFF:]
+
+    a_vals = sol[A_OFF:A_OFF + NB]
+    y_vals = sol[Y_OFF:Y_OFF + NB * NR].reshape(NB, NR)
+
+    slack_sum = float(w_vals.sum())
+    daily_slack = {d: float(w_vals[d - 1]) for d in days}
+
+    room_of = np.where(y_vals.max(axis=1) > 0.5, y_vals.argmax(axis=1) + 1, 0)
+    assignments = []
+    for i in np.flatnonzero(a_vals > 0.5):
+        b = B[i]
+        assigned_r = int(room_of[i]) if room_of[i] else None
+        assignments.append((b, STAY_DAYS[b], assigned_r))
+
+    result = {
+        "Z2": Z2,
+        "slack_sum": slack_sum,
+        "daily_slack": daily_slack,
+        "accepted_bookings": assignments,
+    }
+
+    if verbose:
+        print("=== Two-Tier LCO Direct HiGHS Demo ===")
+        print(f"Tier L2 (Revenue) optimum Z2* = {result['Z2']:.2f}")
+        print(f"Tier L3 (Overbooking slack) total = {result['slack_sum']:.4f}")
+        print("Daily slack per day:")
+        for d in days:
+            print(f"  Day {d}: w_d = {result['daily_slack'][d]:.4f}")
+        print("\nAccepted bookings and assigned room:")
+        for b, sdays, r in result["accepted_bookings"]:
+            print(f"  Booking {b}: stay_days={sdays}, room={r}")
+
+    return result
+
+
+# ---------------------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------------------
+if __name__ == "__main__":
+    run_two_tier_direct()
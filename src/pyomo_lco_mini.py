@@ -21,9 +21,13 @@ By default the script will try to use HiGHS; if unavailable, it will
 fall back to CBC if installed.
 """
 
+import numpy as np
+
+from pyomo.core.expr import LinearExpression
 from pyomo.environ import (
-    ConcreteModel, Set, Var, Param, Binary, NonNegativeReals,
-    Constraint, Objective, maximize, minimize, value, SolverFactory
+    ConcreteModel, Set, Param, Var, Binary, NonNegativeReals,
+    Constraint, ConstraintList, Objective, maximize, minimize, value,
+    SolverFactory
 )
 
 # ---------------------------------------------------------------------
@@ -55,23 +59,38 @@ bookings = {
 }
 
 
-def stay_days(bid):
-    """Return the list of stay-days for booking `bid` within the 5-day horizon."""
-    s, L, _, _ = bookings[bid]
-    return list(range(s, min(s + L, DAYS + 1)))
+B = list(bookings.keys())
 
+# Stay-days per booking, computed once; both model construction and result
+# extraction read this table instead of recomputing the range.
+STAY_DAYS = {
+    b: list(range(s, min(s + L, DAYS + 1)))
+    for b, (s, L, _, _) in bookings.items()
+}
 
-B = list(bookings.keys())
+
+def stay_days(bid):
+    """Return the list of stay-days for booking `bid` within the 5-day horizon."""
+    return STAY_DAYS[bid]
 
 
 # ---------------------------------------------------------------------
 # Model builder
 # ---------------------------------------------------------------------
-def build_model():
+def build_model(presolve=True):
     """Build the two-tier LCO Pyomo model.
 
     Tier L2: Revenue maximization (objective initially)
     Tier L3: Overbooking slack minimization (activated after adding revenue floor)
+
+    When `presolve` is True, bookings whose stay-days never see more
+    concurrent bookings than there are rooms are fixed accepted before the
+    solver sees the model: adding such a booking to any solution stays
+    feasible (interval graphs are perfect, so max overlap <= ROOMS means an
+    R-room schedule exists) and strictly increases revenue, so every
+    optimal solution accepts it. Valid as long as the revenue floor
+    tolerance stays below the smallest per-booking revenue, which holds for
+    the defaults here.
     """
     m = ConcreteModel()
 
@@ -80,69 +99,133 @@ def build_model():
     m.R = Set(initialize=rooms)
     m.D = Set(initialize=days)
 
-    # Parameters
-    m.start = Param(m.B, initialize={b: bookings[b][0] for b in B})
-    m.len = Param(m.B, initialize={b: bookings[b][1] for b in B})
-    m.price = Param(m.B, initialize={b: bookings[b][2] for b in B})
-    m.showp = Param(m.B, initialize={b: bookings[b][3] for b in B})
-    m.cap = Param(m.D, initialize=CAP)
-
-    # Helper sets
-    # (b, d) where d is in the stay of b
-    in_stay = {(b, d) for b in B for d in days if d in stay_days(b)}
-    m.InStay = Set(dimen=2, initialize=in_stay)
-
-    # Triples (b, r, d) only when (b, d) is in stay; avoids unconstrained y's
-    yidx = {(b, r, d) for (b, d) in in_stay for r in rooms}
-    m.YIDX = Set(dimen=3, initialize=yidx)
-
-    # (b, r, d) pairs for continuity when both d and d+1 are in the stay of b
-    cont = {
-        (b, r, d)
-        for b in B
-        for r in rooms
-        for d in days
-        if d in stay_days(b) and (d + 1) in stay_days(b)
-    }
-    m.ContPair = Set(dimen=3, initialize=cont)
+    # Booking data stays in the plain `bookings`/`CAP` dicts; wrapping the
+    # constants in Pyomo Params only adds indexed-component lookup overhead
+    # when the coefficients are read during construction.
+    rev_coef = {b: bookings[b][2] * bookings[b][1] for b in B}  # price * length
+
+    # Helper structures, computed once up front so no constraint rule ever
+    # has to test membership or re-filter the booking list.
+    # Boolean mask: in_stay_mask[b-1, d-1] is True when d is a stay-day of b.
+    in_stay_mask = np.zeros((len(B), DAYS), dtype=bool)
+    for b in B:
+        for d in STAY_DAYS[b]:
+            in_stay_mask[b - 1, d - 1] = True
+
+    # In-stay membership lives in the mask and the inverted index below;
+    # it is plain Python data, not a Pyomo Set component on the model.
+
+    # Inverted index: bookings staying on each day, filled in one pass over
+    # the stay-day lists instead of filtering all of B once per day.
+    bookings_on_day = {d: [] for d in days}
+    for b in B:
+        for d in STAY_DAYS[b]:
+            bookings_on_day[d].append(b)
 
     # Variables
-    m.a = Var(m.B, within=Binary)  # accept booking
-    m.y = Var(m.YIDX, within=Binary)  # assignment (only valid (b, r, d))
-    m.w = Var(m.D, within=NonNegativeReals)  # overbooking slack per day
-
-    # Constraints
-    # 1) Room exclusivity per day: each room at most one booking among those staying that day
-    def room_excl(m, r, d):
-        return sum(m.y[b, r, d] for b in m.B if (b, d) in m.InStay) <= 1
+    # A booking occupies the same room for its whole stay, so one binary per
+    # (booking, room) is enough: the per-day y[b, r, d] tensor and the explicit
+    # continuity equalities it required are redundant.
+    #
+    # All variables live in one flat vector x = [a | y2 | w] indexed by a
+    # plain integer range: a single Var component instead of three, with
+    # Python-side offset maps (stored on the model) to decode positions.
+    nb, nr, nd = len(B), ROOMS, DAYS
+    a_off, y_off, w_off = 0, nb, nb + nb * nr
+    nvar = nb + nb * nr + nd
+
+    m.a_ix = {b: a_off + i for i, b in enumerate(B)}
+    m.y_ix = {
+        (b, r): y_off + i * nr + (r - 1)
+        for i, b in enumerate(B) for r in rooms
+    }
+    m.w_ix = {d: w_off + (d - 1) for d in days}
 
-    m.RoomExcl = Constraint(m.R, m.D, rule=room_excl)
+    def x_domain(m, i):
+        return NonNegativeReals if i >= w_off else Binary
 
-    # 2) If booking accepted, exactly one room each stay day (link acceptance to assignment)
-    def assign_if_accepted(m, b, d):
-        if (b, d) not in m.InStay:
-            return Constraint.Skip
-        return sum(m.y[b, r, d] for r in m.R) == m.a[b]
+    m.x = Var(range(nvar), domain=x_domain)
+    x, a_ix, y_ix, w_ix = m.x, m.a_ix, m.y_ix, m.w_ix
 
-    m.Assign = Constraint(m.B, m.D, rule=assign_if_accepted)
+    # Symmetry breaking: rooms are interchangeable, so any schedule can be
+    # relabeled by order of first room use; booking i (in index order) then
+    # never needs a room numbered above i. Fixing those binaries to zero
+    # prunes equivalent branch-and-bound subtrees.
+    for i, b in enumerate(B, start=1):
+        for r in rooms[i:]:
+            x[y_ix[b, r]].fix(0)
 
-    # 3) Continuity: same room across consecutive stay days
-    def continuity(m, b, r, d):
-        return m.y[b, r, d] == m.y[b, r, d + 1]
+    # Presolve: fix bookings that every optimal solution must accept
+    if presolve:
+        overlap = in_stay_mask.sum(axis=0)  # concurrent bookings per day
+        for b in B:
+            if overlap[in_stay_mask[b - 1]].max() <= ROOMS:
+                x[a_ix[b]].fix(1)
 
-    m.Continuity = Constraint(m.ContPair, rule=continuity)
+    # Constraints
+    # Rows are assembled in plain loops over the precomputed index lists and
+    # bulk-added to ConstraintLists: LinearExpression bodies, no per-index
+    # rule dispatch, no membership tests. Hot names (the expression class,
+    # the variable container, ConstraintList.add) are bound to locals so the
+    # inner loops skip repeated global/attribute lookups.
+    lin_expr = LinearExpression
 
-    # 4) Overbooking slack (capacity-based, consistent with the paper):
+    # 1) Room exclusivity per day: each room at most one booking among those staying that day
+    m.RoomExcl = ConstraintList()
+    add_room_excl = m.RoomExcl.add
+    for d in days:
+        staying = bookings_on_day[d]
+        if not staying:
+            continue
+        ones = [1.0] * len(staying)
+        for r in rooms:
+            lhs = lin_expr(
+                constant=0,
+                linear_coefs=ones,
+                linear_vars=[x[y_ix[b, r]] for b in staying],
+            )
+            add_room_excl(lhs <= 1)
+
+    # 2) If booking accepted, exactly one room for the stay (one row per booking)
+    m.Assign = ConstraintList()
+    add_assign = m.Assign.add
+    assign_coefs = [1.0] * len(rooms) + [-1.0]
+    for b in B:
+        lhs = lin_expr(
+            constant=0,
+            linear_coefs=assign_coefs,
+            linear_vars=[x[y_ix[b, r]] for r in rooms] + [x[a_ix[b]]],
+        )
+        add_assign(lhs == 0)
+
+    # 3) Overbooking slack (capacity-based, consistent with the paper):
     #    w[d] >= expected_shows[d] - Cap_d, with w[d] >= 0 by variable domain
-    def overbook_slack(m, d):
-        expected = sum(m.a[b] * m.showp[b] for b in m.B if (b, d) in m.InStay)
-        return m.w[d] >= expected - m.cap[d]
-
-    m.OverbookSlack = Constraint(m.D, rule=overbook_slack)
+    m.OverbookSlack = ConstraintList()
+    add_overbook = m.OverbookSlack.add
+    for d in days:
+        staying = bookings_on_day[d]
+        lhs = lin_expr(
+            constant=0,
+            linear_coefs=[1.0] + [-bookings[b][3] for b in staying],
+            linear_vars=[x[w_ix[d]]] + [x[a_ix[b]] for b in staying],
+        )
+        add_overbook(lhs >= -CAP[d])
+
+    # Objectives for both tiers are declared up front. The revenue floor is
+    # a mutable Param starting at 0 (never binding, revenue is nonnegative),
+    # so moving from L2 to L3 is a pure parameter update plus an objective
+    # activation flip -- no components are added or deleted between solves.
+    m.RevenueExpr = LinearExpression(
+        constant=0,
+        linear_coefs=[rev_coef[b] for b in B],
+        linear_vars=[x[a_ix[b]] for b in B],
+    )
+    m.rev_floor = Param(initialize=0.0, mutable=True)
+    m.RevenueFloor = Constraint(expr=m.RevenueExpr >= m.rev_floor)
 
-    # Objective (Tier L2 by default): maximize total expected revenue over accepted bookings
-    m.RevenueExpr = sum(m.a[b] * m.price[b] * m.len[b] for b in m.B)
-    m.obj = Objective(expr=m.RevenueExpr, sense=maximize)
+    m.obj = Objective(expr=m.RevenueExpr, sense=maximize)  # Tier L2
+    m.obj_slack = Objective(expr=sum(x[w_ix[d]] for d in days), sense=minimize)  # Tier L3
+    m.obj_slack.deactivate()
 
     return m
 
@@ -151,7 +234,25 @@ def build_model():
 # Solver helper
 # ---------------------------------------------------------------------
 def get_solver():
-    """Try HiGHS first, then CBC. Raise error if neither is available."""
+    """Return a solver, preferring the APPSI persistent interfaces.
+
+    The persistent APPSI solvers talk to HiGHS/CBC in memory and keep the
+    instance between solves, so the two-tier routine avoids writing an LP
+    file and re-parsing it for each tier. Order of preference:
+    APPSI HiGHS, APPSI CBC, then the legacy file-based plugins.
+    """
+    try:
+        from pyomo.contrib.appsi.solvers import Cbc as AppsiCbc
+        from pyomo.contrib.appsi.solvers import Highs as AppsiHighs
+
+        for cls in (AppsiHighs, AppsiCbc):
+            solver = cls()
+            if solver.available():
+                solver.config.stream_solver = False
+                return solver
+    except Exception:
+        pass
+
     for name in ("highs", "cbc"):
         try:
             solver = SolverFactory(name)
@@ -166,6 +267,31 @@ def get_solver():
     )
 
 
+def solve_with(solver, m, warmstart=False):
+    """Solve `m`, handling the APPSI vs. legacy interface differences."""
+    if hasattr(solver, "config"):  # APPSI persistent interface
+        return solver.solve(m)
+    if warmstart:
+        try:
+            return solver.solve(m, warmstart=True, tee=False)
+        except (TypeError, ValueError):
+            pass
+    return solver.solve(m, tee=False)
+
+
+def bulk_values(res, variables):
+    """Return the primal values of `variables` as a list of floats.
+
+    APPSI results expose a solution loader that hands back all requested
+    primals in one call; otherwise fall back to per-variable value().
+    """
+    loader = getattr(res, "solution_loader", None)
+    if loader is not None:
+        primals = loader.get_primals(variables)
+        return [float(primals[v]) for v in variables]
+    return [float(value(v)) for v in variables]
+
+
 # ---------------------------------------------------------------------
 # Two-tier solve: L2 then L3
 # ---------------------------------------------------------------------
@@ -175,7 +301,9 @@ def run_two_tier_demo(eps=1e-6, verbose=True):
     Parameters
     ----------
     eps : float
-        Small tolerance for the revenue floor: Rev >= Z2* - eps.
+        Relative tolerance for the revenue floor:
+        Rev >= Z2* - eps * max(1, |Z2*|), so the floor is meaningful at any
+        revenue scale instead of demanding absolute 1e-6 optimality.
     verbose : bool
         If True, prints summary results to stdout.
 
@@ -193,35 +321,60 @@ def run_two_tier_demo(eps=1e-6, verbose=True):
     solver = get_solver()
 
     # Tier L2: maximize revenue
-    res2 = solver.solve(m, tee=False)
+    res2 = solve_with(solver, m)
     Z2 = value(m.RevenueExpr)
 
-    # Inject revenue floor and switch to Tier L3: minimize sum of w[d]
-    m.RevenueFloor = Constraint(expr=m.RevenueExpr >= Z2 - eps)
-    m.del_component(m.obj)
-    m.obj = Objective(expr=sum(m.w[d] for d in m.D), sense=minimize)
-
-    res3 = solver.solve(m, tee=False)
-    slack_sum = sum(value(m.w[d]) for d in m.D)
-    daily_slack = {d: float(value(m.w[d])) for d in m.D}
+    a_vars = [m.x[m.a_ix[b]] for b in B]
+    a_vals = np.array(bulk_values(res2, a_vars))
+
+    # Minimal slack implied by the L2 acceptance: w[d] is only bounded below
+    # by expected shows minus capacity (and zero). If that bound is already
+    # zero on every day, no L3 solve can improve the slack objective and the
+    # second MILP is skipped outright.
+    expected = {d: 0.0 for d in days}
+    for i, b in enumerate(B):
+        if a_vals[i] > 0.5:
+            for d in STAY_DAYS[b]:
+                expected[d] += bookings[b][3]
+    implied_slack = {d: max(0.0, expected[d] - CAP[d]) for d in days}
+
+    if max(implied_slack.values()) <= 1e-9:
+        # The L2 incumbent is already lexicographically optimal.
+        res3 = res2
+        w_vals = [implied_slack[d] for d in days]
+    else:
+        # Raise the revenue floor and switch to Tier L3: minimize sum of
+        # w[d]. Both are in-place mutations (Param update, objective
+        # activation flip), so the persistent solver only retransmits what
+        # actually changed.
+        m.rev_floor.set_value(Z2 - eps * max(1.0, abs(Z2)))
+        m.obj.deactivate()
+        m.obj_slack.activate()
+
+        # The L2 solution was loaded into the variables and satisfies the
+        # floor, so it is a feasible incumbent for L3: warm-start instead of
+        # re-solving cold. The APPSI path keeps the HiGHS instance alive
+        # between tiers and only transmits the floor row and the objective.
+        res3 = solve_with(solver, m, warmstart=True)
+        w_vals = bulk_values(res3, [m.x[m.w_ix[d]] for d in days])
+        a_vals = np.array(bulk_values(res3, a_vars))
+
+    slack_sum = sum(w_vals)
+    daily_slack = {d: w_vals[d - 1] for d in days}
+
+    # All primals are pulled in bulk rather than one value() call per
+    # variable; the y2 block lands in one (B, R) array and the chosen room
+    # is read off with argmax instead of looping bookings x rooms in Python.
+    y_vals = np.array(
+        bulk_values(res3, [m.x[m.y_ix[b, r]] for b in B for r in rooms])
+    ).reshape(len(B), len(rooms))
+    room_of = np.where(y_vals.max(axis=1) > 0.5, y_vals.argmax(axis=1) + 1, 0)
 
-    # Extract accepted bookings and room assignments
     assignments = []
-    for b in m.B:
-        if value(m.a[b]) > 0.5:
-            sdays = stay_days(int(b))
-            assigned_r = None
-            for r in m.R:
-                ok = True
-                for d in sdays:
-                    key = (int(b), int(r), int(d))
-                    if key not in m.YIDX or value(m.y[key]) <= 0.5:
-                        ok = False
-                        break
-                if ok:
-                    assigned_r = int(r)
-                    break
-            assignments.append((int(b), sdays, assigned_r))
+    for i in np.flatnonzero(a_vals > 0.5):
+        b = B[i]
+        assigned_r = int(room_of[i]) if room_of[i] else None
+        assignments.append((b, STAY_DAYS[b], assigned_r))
 
     result = {
         "Z2": float(Z2),
@@ -16,11 +16,14 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, Tuple, List, Optional
 
+import numpy as np
+
 try:
+    from pyomo.core.expr import LinearExpression
     from pyomo.environ import (
         ConcreteModel, Set, Param, Var,
         Binary, NonNegativeReals,
-        Constraint, Objective, maximize, minimize,
+        Constraint, ConstraintList, Objective, maximize, minimize,
         value, SolverFactory
     )
 except ImportError as e:
@@ -34,7 +37,7 @@ except ImportError as e:
 # Data structures
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class BookingSpec:
     start_day: int
     length_of_stay: int
@@ -42,7 +45,7 @@ class BookingSpec:
     show_prob: float
 
 
-@dataclass
+@dataclass(slots=True)
 class LCOResult:
     revenue_L2: float
     slack_L3: float
@@ -89,6 +92,7 @@ def build_static_lco_model(
     days: int = 5,
     rooms: int = 10,
     capacity_by_day: Optional[Dict[int, int]] = None,
+    presolve: bool = True,
 ):
     """Build the static 2–tier LCO Pyomo model.
 
@@ -102,6 +106,13 @@ def build_static_lco_model(
         Number of rooms (default 10).
     capacity_by_day : dict[int, int], optional
         Capacity per day. If None, uses `rooms` for every day.
+    presolve : bool
+        If True, fix the acceptance of bookings whose stay-days never see
+        more concurrent bookings than there are rooms. Such bookings can be
+        added to any schedule (max overlap <= rooms keeps the interval graph
+        R-colorable) and carry positive revenue, so every optimal solution
+        accepts them. Valid whenever the revenue-floor tolerance is below
+        the smallest per-booking revenue.
 
     Returns
     -------
@@ -118,101 +129,199 @@ def build_static_lco_model(
     m.R = Set(initialize=list(range(1, rooms + 1)))
     m.B = Set(initialize=list(bookings.keys()))
 
-    # ---- Parameters
-    m.start = Param(
-        m.B,
-        initialize={b: spec.start_day for b, spec in bookings.items()},
-        within=m.D
-    )
-    m.length = Param(
-        m.B,
-        initialize={b: spec.length_of_stay for b, spec in bookings.items()},
-    )
-    m.price = Param(
-        m.B,
-        initialize={b: spec.price_per_night for b, spec in bookings.items()},
-    )
-    m.showp = Param(
-        m.B,
-        initialize={b: spec.show_prob for b, spec in bookings.items()},
-    )
-
+    # ---- Coefficient data
+    # Booking attributes and capacities stay in plain Python containers;
+    # Pyomo Param wrappers would only add indexed-component lookup overhead
+    # when the constants are read during construction.
     if capacity_by_day is None:
         capacity_by_day = {d: rooms for d in range(1, days + 1)}
-    m.cap = Param(m.D, initialize=capacity_by_day)
-
-    # Helper: stay-days for each booking
-    def _stay_days(b):
-        s = int(m.start[b])
-        L = int(m.length[b])
-        return [d for d in m.D if d >= s and d < s + L]
-
-    instay = {(b, d) for b in m.B for d in m.D if d in _stay_days(b)}
-    m.InStay = Set(dimen=2, initialize=instay)
-
-    yidx = {(b, r, d) for (b, d) in instay for r in m.R}
-    m.YIDX = Set(dimen=3, initialize=yidx)
-
-    cont = {
-        (b, r, d)
-        for b in m.B
-        for r in m.R
-        for d in m.D
-        if (b, d) in instay and (b, d + 1) in instay
+    rev_coef = {
+        b: spec.price_per_night * spec.length_of_stay
+        for b, spec in bookings.items()
+    }
+
+    # Helper structures, computed once so the constraint rules below never
+    # re-filter bookings or test set membership.
+    day_list = list(range(1, days + 1))
+    booking_ids = list(bookings.keys())
+    # Stay-days come straight from the (start, length) range clipped to the
+    # horizon -- no per-booking scan over every day with a membership test.
+    stay_days_of = {
+        b: list(range(
+            spec.start_day,
+            min(spec.start_day + spec.length_of_stay, days + 1),
+        ))
+        for b, spec in bookings.items()
     }
-    m.ContPair = Set(dimen=3, initialize=cont)
+
+    # Boolean mask over (booking position, day position)
+    in_stay_mask = np.zeros((len(booking_ids), days), dtype=bool)
+    for i, b in enumerate(booking_ids):
+        for d in stay_days_of[b]:
+            in_stay_mask[i, d - 1] = True
+
+    # In-stay membership lives in the mask and the inverted index below;
+    # it is plain Python data, not a Pyomo Set component on the model.
+
+    # Inverted index: bookings staying on each day, filled in one pass over
+    # the stay-day lists instead of filtering every booking once per day.
+    bookings_on_day: Dict[int, List[int]] = {d: [] for d in day_list}
+    for b in booking_ids:
+        for d in stay_days_of[b]:
+            bookings_on_day[d].append(b)
 
     # ---- Variables
+    # A booking keeps the same room for its whole stay, so a single binary
+    # per (booking, room) replaces the per-day assignment tensor and the
+    # continuity equalities that tied consecutive days together.
     m.a = Var(m.B, within=Binary)               # accept booking
-    m.y = Var(m.YIDX, within=Binary)            # assignment
+    m.y2 = Var(m.B, m.R, within=Binary)         # room choice for the stay
     m.w = Var(m.D, within=NonNegativeReals)     # overbooking slack per day
 
+    # ---- Symmetry breaking
+    # Rooms are interchangeable, so any schedule can be relabeled by order
+    # of first room use; booking i (in index order) then never needs a room
+    # numbered above i. Fixing those binaries prunes equivalent subtrees.
+    for i, b in enumerate(booking_ids, start=1):
+        for r in range(i + 1, rooms + 1):
+            m.y2[b, r].fix(0)
+
+    # ---- Presolve: fix bookings that every optimal solution must accept
+    if presolve:
+        overlap = in_stay_mask.sum(axis=0)      # concurrent bookings per day
+        for i, b in enumerate(booking_ids):
+            # Bookings with an empty (clipped) stay contribute no revenue
+            # and no occupancy, so there is nothing to fix for them -- and
+            # reducing over their empty mask row would be an error.
+            if in_stay_mask[i].any() and overlap[in_stay_mask[i]].max() <= rooms:
+                m.a[b].fix(1)
+
     # ---- Constraints
+    # Rows are assembled in plain loops over the precomputed index lists and
+    # bulk-added to ConstraintLists: LinearExpression bodies, no per-index
+    # rule dispatch, no membership tests. Hot names (the expression class,
+    # variable containers, ConstraintList.add) are bound to locals so the
+    # inner loops skip repeated global/attribute lookups.
+    lin_expr = LinearExpression
+    y2, a, w = m.y2, m.a, m.w
 
     # 1) Room exclusivity
-    def room_excl(m, r, d):
-        return sum(
-            m.y[b, r, d] for b in m.B
-            if (b, d) in m.InStay
-        ) <= 1
-
-    m.RoomExcl = Constraint(m.R, m.D, rule=room_excl)
-
-    # 2) Acceptance/assignment link
-    def assign_link(m, b, d):
-        if (b, d) not in m.InStay:
-            return Constraint.Skip
-        return sum(m.y[b, r, d] for r in m.R) == m.a[b]
-
-    m.Assign = Constraint(m.B, m.D, rule=assign_link)
-
-    # 3) Continuity
-    def continuity(m, b, r, d):
-        return m.y[b, r, d] == m.y[b, r, d + 1]
-
-    m.Continuity = Constraint(m.ContPair, rule=continuity)
-
-    # 4) Overbooking slack (expected shows vs capacity)
-    def overbooking(m, d):
-        exp_shows = sum(
-            m.a[b] * m.showp[b]
-            for b in m.B
-            if (b, d) in m.InStay
+    m.RoomExcl = ConstraintList()
+    add_room_excl = m.RoomExcl.add
+    room_ids = list(range(1, rooms + 1))
+    for d in day_list:
+        staying = bookings_on_day[d]
+        if not staying:
+            continue
+        ones = [1.0] * len(staying)
+        for r in room_ids:
+            lhs = lin_expr(
+                constant=0,
+                linear_coefs=ones,
+                linear_vars=[y2[b, r] for b in staying],
+            )
+            add_room_excl(lhs <= 1)
+
+    # 2) Acceptance/assignment link (one row per booking)
+    m.Assign = ConstraintList()
+    add_assign = m.Assign.add
+    assign_coefs = [1.0] * len(room_ids) + [-1.0]
+    for b in booking_ids:
+        lhs = lin_expr(
+            constant=0,
+            linear_coefs=assign_coefs,
+            linear_vars=[y2[b, r] for r in room_ids] + [a[b]],
         )
-        return m.w[d] >= exp_shows - m.cap[d]
-
-    m.Overbook = Constraint(m.D, rule=overbooking)
+        add_assign(lhs == 0)
+
+    # 3) Overbooking slack (expected shows vs capacity)
+    m.Overbook = ConstraintList()
+    add_overbook = m.Overbook.add
+    for d in day_list:
+        staying = bookings_on_day[d]
+        lhs = lin_expr(
+            constant=0,
+            linear_coefs=[1.0] + [-bookings[b].show_prob for b in staying],
+            linear_vars=[w[d]] + [a[b] for b in staying],
+        )
+        add_overbook(lhs >= -capacity_by_day[d])
+
+    # ---- Objectives and revenue floor
+    # Both tier objectives are declared up front; the revenue floor is a
+    # mutable Param starting at 0 (never binding, revenue is nonnegative).
+    # Moving from L2 to L3 is then a parameter update plus an objective
+    # activation flip, with no component additions or deletions.
+    m.RevExpr = LinearExpression(
+        constant=0,
+        linear_coefs=[rev_coef[b] for b in booking_ids],
+        linear_vars=[m.a[b] for b in booking_ids],
+    )
+    m.rev_floor = Param(initialize=0.0, mutable=True)
+    m.RevenueFloor = Constraint(expr=m.RevExpr >= m.rev_floor)
 
-    # ---- Tier L2 objective: maximize revenue
-    m.RevExpr = sum(
-        m.a[b] * m.price[b] * m.length[b]
-        for b in m.B
+    m.obj = Objective(expr=m.RevExpr, sense=maximize)               # Tier L2
+    m.obj_slack = Objective(
+        expr=sum(w[d] for d in day_list), sense=minimize            # Tier L3
     )
-    m.obj = Objective(expr=m.RevExpr, sense=maximize)
+    m.obj_slack.deactivate()
 
     return m
 
 
+# ---------------------------------------------------------------------------
+# Solver helpers
+# ---------------------------------------------------------------------------
+
+_APPSI_NAMES = {"highs": "Highs", "cbc": "Cbc"}
+
+
+def _make_solver(solver_name: str):
+    """Return a solver for `solver_name`, preferring the APPSI interface.
+
+    The persistent APPSI solvers keep the translated instance in memory
+    between the L2 and L3 solves, avoiding the LP-file round trip of the
+    legacy plugins. Falls back to ``SolverFactory`` when no APPSI
+    counterpart exists or it is unavailable.
+    """
+    cls_name = _APPSI_NAMES.get(solver_name.lower())
+    if cls_name is not None:
+        try:
+            import pyomo.contrib.appsi.solvers as appsi_solvers
+
+            solver = getattr(appsi_solvers, cls_name)()
+            if solver.available():
+                solver.config.stream_solver = False
+                return solver
+        except Exception:
+            pass
+    return SolverFactory(solver_name)
+
+
+def _solve(solver, m, warmstart: bool = False):
+    """Solve `m`, smoothing over APPSI vs. legacy interface differences."""
+    if hasattr(solver, "config"):  # APPSI persistent interface
+        return solver.solve(m)
+    if warmstart:
+        try:
+            return solver.solve(m, warmstart=True, tee=False)
+        except (TypeError, ValueError):
+            pass
+    return solver.solve(m, tee=False)
+
+
+def _bulk_values(res, variables) -> List[float]:
+    """Return the primal values of `variables` as a list of floats.
+
+    APPSI results expose a solution loader that hands back all requested
+    primals in one call; otherwise fall back to per-variable value().
+    """
+    loader = getattr(res, "solution_loader", None)
+    if loader is not None:
+        primals = loader.get_primals(variables)
+        return [float(primals[v]) for v in variables]
+    return [float(value(v)) for v in variables]
+
+
 # ---------------------------------------------------------------------------
 # Two–tier solve: L2 then L3
 # ---------------------------------------------------------------------------
@@ -224,6 +333,7 @@ def solve_two_tier_lco(
     capacity_by_day: Optional[Dict[int, int]] = None,
     solver_name: str = "highs",
     revenue_floor_tolerance: float = 1e-6,
+    presolve: bool = True,
 ) -> LCOResult:
     """Solve the 2–tier LCO problem (L2 -> L3) and return a compact result.
 
@@ -231,57 +341,105 @@ def solve_two_tier_lco(
 
     1. Builds the static model.
     2. Solves Tier L2 (maximize revenue) and records Z2*.
-    3. Injects a revenue floor Rev >= Z2* - eps.
-    4. Switches to Tier L3 objective: minimize sum_d w[d].
+    3. Raises the built-in revenue floor to
+       Rev >= Z2* - tol * max(1, |Z2*|); the tolerance is relative so the
+       floor stays meaningful at any revenue scale.
+    4. Activates the Tier L3 objective: minimize sum_d w[d].
     5. Solves Tier L3 and extracts key metrics.
+
+    The L3 solve is skipped when the L2 acceptance already implies zero
+    overbooking slack on every day: w is bounded below by expected shows
+    minus capacity (and zero), so no re-solve can improve on that.
     """
+    if bookings is None:
+        bookings = build_default_bookings()
+
     m = build_static_lco_model(
         bookings=bookings,
         days=days,
         rooms=rooms,
         capacity_by_day=capacity_by_day,
+        presolve=presolve,
     )
 
-    opt = SolverFactory(solver_name)
+    opt = _make_solver(solver_name)
+
+    day_ids = list(m.D)
+    booking_ids = list(m.B)
+    room_ids = list(m.R)
+    if capacity_by_day is None:
+        capacity_by_day = {d: rooms for d in day_ids}
+    last_day = max(day_ids)
+    stay_days_of = {
+        b: list(range(
+            spec.start_day,
+            min(spec.start_day + spec.length_of_stay, last_day + 1),
+        ))
+        for b, spec in bookings.items()
+    }
 
     # ---- Tier L2: max revenue
-    res_L2 = opt.solve(m, tee=False)
+    res_L2 = _solve(opt, m)
     Z2 = value(m.RevExpr)
 
-    # ---- Inject revenue floor and switch to Tier L3
-    m.RevenueFloor = Constraint(expr=m.RevExpr >= Z2 - revenue_floor_tolerance)
-    m.del_component(m.obj)
-    m.obj = Objective(expr=sum(m.w[d] for d in m.D), sense=minimize)
-
-    res_L3 = opt.solve(m, tee=False)
+    a_vars = [m.a[b] for b in booking_ids]
+    a_vals = np.array(_bulk_values(res_L2, a_vars))
+
+    # Minimal slack implied by the L2 acceptance: w[d] is only bounded below
+    # by expected shows minus capacity (and zero). If that bound is already
+    # zero on every day, the L2 incumbent is lexicographically optimal and
+    # the L3 MILP is skipped.
+    expected = {d: 0.0 for d in day_ids}
+    for i, b in enumerate(booking_ids):
+        if a_vals[i] > 0.5:
+            for d in stay_days_of[b]:
+                expected[d] += bookings[b].show_prob
+    implied_slack = {
+        d: max(0.0, expected[d] - capacity_by_day[d]) for d in day_ids
+    }
 
-    # ---- Extract results
-    slack_by_day = {int(d): float(value(m.w[d])) for d in m.D}
+    if max(implied_slack.values()) <= 1e-9:
+        res_L3 = res_L2
+        w_vals = [implied_slack[d] for d in day_ids]
+    else:
+        # ---- Raise the revenue floor and switch to Tier L3
+        # In-place mutations only (Param update, objective activation flip),
+        # so a persistent solver retransmits just what changed.
+        floor_eps = revenue_floor_tolerance * max(1.0, abs(Z2))
+        m.rev_floor.set_value(Z2 - floor_eps)
+        m.obj.deactivate()
+        m.obj_slack.activate()
+
+        # The L2 solution already satisfies the revenue floor, so hand it to
+        # the L3 solve as a warm-start incumbent where the plugin supports
+        # it; with APPSI only the floor row and the objective are sent.
+        res_L3 = _solve(opt, m, warmstart=True)
+        w_vals = _bulk_values(res_L3, [m.w[d] for d in day_ids])
+        a_vals = np.array(_bulk_values(res_L3, a_vars))
+
+    # ---- Extract results (primals pulled in bulk, not one value() each)
+    slack_by_day = {int(d): w_vals[i] for i, d in enumerate(day_ids)}
     slack_sum = sum(slack_by_day.values())
 
-    accepted_bookings = [int(b) for b in m.B if value(m.a[b]) > 0.5]
+    accepted_bookings = [int(booking_ids[i]) for i in np.flatnonzero(a_vals > 0.5)]
 
-    # Determine a single room per booking (if assigned consistently)
-    # and its stay-days.
-    def _stay_days_local(b):
-        s = int(m.start[b])
-        L = int(m.length[b])
-        return [d for d in m.D if d >= s and d < s + L]
+    # Determine a single room per booking and its stay-days. The y2 values
+    # are gathered into one (B, R) array and the chosen room read off with
+    # argmax instead of probing rooms one by one in Python.
+
+    y_vals = np.array(
+        _bulk_values(
+            res_L3, [m.y2[b, r] for b in booking_ids for r in room_ids]
+        )
+    ).reshape(len(booking_ids), len(room_ids))
+    room_of = np.where(y_vals.max(axis=1) > 0.5, y_vals.argmax(axis=1), -1)
+    room_index = {int(b): int(room_of[i]) for i, b in enumerate(booking_ids)}
 
     room_assignments: Dict[int, Tuple[Optional[int], List[int]]] = {}
     for b in accepted_bookings:
-        sdays = _stay_days_local(b)
-        chosen_room = None
-        for r in m.R:
-            ok = True
-            for d in sdays:
-                if (b, r, d) not in m.YIDX or value(m.y[b, r, d]) <= 0.5:
-                    ok = False
-                    break
-            if ok:
-                chosen_room = int(r)
-                break
-        room_assignments[int(b)] = (chosen_room, [int(d) for d in sdays])
+        idx = room_index[b]
+        chosen_room = int(room_ids[idx]) if idx >= 0 else None
+        room_assignments[b] = (chosen_room, [int(d) for d in stay_days_of[b]])
 
     return LCOResult(
         revenue_L2=float(Z2),